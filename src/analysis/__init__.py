@@ -1,4 +1,6 @@
 from .game_analyzer import (
+    AnalysisResult,
+    DeathBannerGate,
     FrameState,
     check_for_death_frame,
     check_overheat,
@@ -6,7 +8,9 @@ from .game_analyzer import (
 )
 
 __all__ = [
+    "AnalysisResult",
     "check_overheat",
+    "DeathBannerGate",
     "FrameState",
     "team_diff_at_death",
     "check_for_death_frame",
@@ -4,7 +4,6 @@ Detects when monitored player takes unnecessary fights.
 """
 
 import time
-from dataclasses import dataclass, field
 from enum import Enum, auto
 
 from cv2.typing import MatLike
@@ -12,6 +11,9 @@ from loguru import logger
 
 from src.detection import hud_detection
 
+# an enemy has to die within this window after the player for a trade
+TRADE_WINDOW_NS = 3_000_000_000
+
 
 class AnalysisResult(Enum):
     OVERHEAT = auto()
@@ -19,48 +21,98 @@ class AnalysisResult(Enum):
     SAFE_RESET = auto()
 
 
-@dataclass
 class FrameState:
-    """Current game state."""
+    """Current game state.
+
+    Only the values derived from the frame are kept. The frame itself is dropped
+    once detection ran, so a retained state (e.g. the death state held for the
+    whole trade window) costs a few bytes instead of pinning tens of MB of pixels.
+    """
+
+    __slots__ = ("team_diff", "timestamp_ns")
+
+    def __init__(self, frame: MatLike, team_diff: int | None = None) -> None:
+        self.team_diff: int | None = (
+            detect_team_diff(frame=frame) if team_diff is None else team_diff
+        )
+        # monotonic so NTP/wall-clock jumps can't open or close the trade window
+        self.timestamp_ns: int = time.monotonic_ns()
+
+    def __repr__(self) -> str:
+        return (
+            f"FrameState(team_diff={self.team_diff}, timestamp_ns={self.timestamp_ns})"
+        )
+
+
+class DeathBannerGate:
+    """Decides which frames get their death banner OCR'd.
+
+    The banner is compared against the last banner that was OCR'd and needs no
+    further look (no death, or a death already reported), not against the
+    previous frame. A death is then retried rather than missed when the first
+    OCR fails while the banner fades in, when the team diff at death can't be
+    reconstructed yet, or when monitoring starts while the player is dead.
+    """
+
+    __slots__ = ("_checked_banner",)
+
+    def __init__(self) -> None:
+        # copy of the banner pixels, capture buffers are reused by the producer
+        self._checked_banner: MatLike | None = None
+
+    def should_check(self, frame: MatLike) -> bool:
+        if self._checked_banner is None:
+            return True
+        return hud_detection.regions_differ(
+            prev_region=self._checked_banner,
+            region=hud_detection.crop_roi(
+                frame=frame, roi=hud_detection.ROI_DEATH_BANNER
+            ),
+        )
 
-    frame: MatLike
-    team_diff: int | None = None
-    timestamp_ms: int = field(default_factory=lambda: int(time.time() * 1000))
+    def mark_checked(self, frame: MatLike) -> None:
+        self._checked_banner = hud_detection.crop_roi(
+            frame=frame, roi=hud_detection.ROI_DEATH_BANNER
+        ).copy()
 
-    def __post_init__(self):
-        if self.team_diff is None:
-            team1, team2 = hud_detection.detect_agent_icons(frame=self.frame)
-            self.team_diff = len(team1) - len(team2)
+
+def detect_team_diff(frame: MatLike) -> int:
+    # detections are memoized per frame, so repeated calls on the same frame are free
+    team1, team2 = hud_detection.detect_agent_icons(frame=frame)
+    return len(team1) - len(team2)
 
 
 def team_diff_at_death(
     target_player: str, prev_frame: MatLike, cur_frame: MatLike
 ) -> int:
-    # team diff at prev frame
-    team1, team2 = hud_detection.detect_agent_icons(frame=prev_frame)
-    prev_team_diff = len(team1) - len(team2)
-
-    # team diff at current frame
-    team1, team2 = hud_detection.detect_agent_icons(frame=cur_frame)
-    curr_team_diff = len(team1) - len(team2)
+    prev_team_diff = detect_team_diff(frame=prev_frame)
+    cur_team_diff = detect_team_diff(frame=cur_frame)
 
-    if curr_team_diff + 1 == prev_team_diff:
-        # player was the only death that occured
-        return curr_team_diff
+    if cur_team_diff + 1 == prev_team_diff:
+        # player was the only death that occured, no kill feed OCR needed
+        return cur_team_diff
 
     # death event reconstruction until we find score at player death
     kill_feed = hud_detection.detect_kill_feed(frame=cur_frame)
-    team_diff_at_event = prev_team_diff
     logger.info(f"death: {kill_feed=}")
 
+    return _walk_feed(
+        kill_feed=kill_feed, target_player=target_player, start_diff=prev_team_diff
+    )
+
+
+def _walk_feed(
+    kill_feed: list[hud_detection.KillFeedLine], target_player: str, start_diff: int
+) -> int:
+    # replay feed events from start_diff until the target player's death
+    target_hash = hud_detection.name_hash(target_player)
+    team_diff_at_event = start_diff
+
     for feed_event in kill_feed:
-        team_diff_at_event = (
-            team_diff_at_event - 1
-            if feed_event["was_team_death"]
-            else team_diff_at_event + 1
-        )
-        if feed_event["victim"].lower() == target_player.lower():
-            return team_diff_at_event
+        # team death -> -1, enemy death -> +1
+        team_diff_at_event += 1 - 2 * feed_event["was_team_death"]
+        if feed_event["victim_hash"] == target_hash:
+            break
 
     return team_diff_at_event
 
@@ -69,8 +121,16 @@ def check_for_death_frame(
     prev_frame: MatLike,
     frame: MatLike,
     player_name: str,
+    gate: DeathBannerGate,
 ) -> FrameState | None:
+    # nearly every frame is not a death frame: only OCR when the banner differs
+    # from the last one checked, and only reconstruct the team diff once the
+    # death is confirmed
+    if not gate.should_check(frame=frame):
+        return None
+
     if not hud_detection.is_player_dead(frame=frame):
+        gate.mark_checked(frame=frame)
         return None
 
     true_team_diff = team_diff_at_death(
@@ -80,11 +140,12 @@ def check_for_death_frame(
     )
     logger.info(f"Player is dead, {true_team_diff=}")
 
-    return (
-        FrameState(frame=frame, team_diff=true_team_diff)
-        if true_team_diff >= -1
-        else None
-    )
+    if true_team_diff < -1:
+        # gate stays open, the death is retried on the next frame
+        return None
+
+    gate.mark_checked(frame=frame)
+    return FrameState(frame=frame, team_diff=true_team_diff)
 
 
 def check_overheat(
@@ -98,7 +159,7 @@ def check_overheat(
 
     death_traded = cur_frame_state.team_diff > death_frame_state.team_diff
     trade_window_expired = (
-        cur_frame_state.timestamp_ms - death_frame_state.timestamp_ms > 3000
+        cur_frame_state.timestamp_ns - death_frame_state.timestamp_ns > TRADE_WINDOW_NS
     )
 
     if trade_window_expired:
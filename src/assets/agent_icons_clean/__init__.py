@@ -0,0 +1,4 @@
+# prebuilt template arrays in this package, per mirrored flag: a .npy of
+# (agents, 2, h, w) uint8 grayscale + alpha and a .txt of agent names, written
+# by src/utility/clean_agents_and_flip.py and read by src.detection.hud_detection
+TEMPLATE_ARRAYS = {False: "templates_team1", True: "templates_team2"}
@@ -1,2 +1,13 @@
-from .screen_capture import capture_screen
-__all__= ["capture_screen"]
+from .screen_capture import (
+    CaptureThread,
+    ScreenCapturer,
+    capture_screen,
+    capture_screen_gray,
+)
+
+__all__ = [
+    "CaptureThread",
+    "ScreenCapturer",
+    "capture_screen",
+    "capture_screen_gray",
+]
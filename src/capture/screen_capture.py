@@ -6,21 +6,104 @@ for Valorant gameplay analysis. Uses MSS (Multiple Screenshot System) for fast,
 cross-platform screen capture with OpenCV for image processing.
 """
 
+import threading
+import time
+from collections import deque
+from typing import cast
+
 import cv2
 import mss
 import numpy as np
 from cv2.typing import MatLike
 from loguru import logger
+from mss.base import MSSBase
+
+# death events are >= 1s apart, analyzing a frame every 100ms is plenty
+CAPTURE_PERIOD_NS = 100_000_000
+
+
+class ScreenCapturer:
+    """Grabs the primary monitor, reusing one MSS handle per thread.
+
+    Opening an MSS instance connects to the display server (X11/Quartz/GDI) and
+    enumerates monitors, so it is done once per thread on first use instead of
+    on every frame. MSS handles are not thread-safe, hence one per thread.
+
+    Example:
+        >>> capturer = ScreenCapturer()
+        >>> frame = capturer.grab()
+        >>> capturer.close()
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def _sct(self) -> tuple[MSSBase, dict[str, int]]:
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = mss.mss()
+            self._local.monitor = sct.monitors[1]
+        return sct, self._local.monitor
+
+    def grab_bgra(self) -> np.ndarray:
+        """Grabs the primary monitor as a zero-copy BGRA view over the MSS bytes."""
+        sct, monitor = self._sct()
+        screenshot = sct.grab(
+            monitor
+        )  # implemented using C/C++ so only accepts positional arguments
+
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+            screenshot.height, screenshot.width, 4
+        )
+
+    def grab(self) -> MatLike:
+        """Grabs the primary monitor as a zero-copy BGR view (alpha sliced away)."""
+        return self.grab_bgra()[:, :, :3]
+
+    def grab_into(self, dst: np.ndarray | None = None) -> np.ndarray:
+        """Grabs the primary monitor into a reusable contiguous BGR buffer.
+
+        Args:
+            dst (np.ndarray | None): Preallocated (H, W, 3) uint8 buffer to write
+                into. A new one is allocated if None or if its shape no longer
+                matches the monitor.
+
+        Returns:
+            np.ndarray: The BGR frame, `dst` itself whenever it could be reused.
+            Its contents are only valid until the next grab into the same buffer.
+        """
+        return cv2.cvtColor(src=self.grab_bgra(), code=cv2.COLOR_BGRA2BGR, dst=dst)
+
+    def grab_gray(self) -> MatLike:
+        """Grabs the primary monitor as a contiguous grayscale frame.
+
+        The BGRA -> gray conversion runs straight off the MSS buffer, so only a
+        single-channel frame (a third of the BGR bytes) is ever allocated.
+        """
+        return cv2.cvtColor(src=self.grab_bgra(), code=cv2.COLOR_BGRA2GRAY)
+
+    def close(self) -> None:
+        """Releases the calling thread's MSS handle."""
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+# shared capturer behind capture_screen()
+_CAPTURER = ScreenCapturer()
 
 
 def capture_screen() -> MatLike:
     """Captures a single frame from the primary monitor.
 
-    Uses MSS to grab a screenshot from the primary monitor and converts it
-    from BGRA to BGR format for OpenCV compatibility.
+    Uses MSS to grab a screenshot from the primary monitor and wraps its raw
+    BGRA buffer without copying. The alpha channel is dropped by slicing, so the
+    returned frame is a BGR view over the MSS buffer rather than a converted copy.
+    The MSS handle is kept open between calls (one per thread).
 
     Returns:
-        MatLike: Screenshot frame in BGR format as numpy array.
+        MatLike: Screenshot frame in BGR format as a (non-contiguous) numpy view.
 
     Raises:
         Exception: If screen capture fails or monitor is not accessible.
@@ -30,22 +113,154 @@ def capture_screen() -> MatLike:
         >>> print(f"Frame shape: {frame.shape}")
         Frame shape: (1440, 2560, 3)
     """
-    with mss.mss() as sct:
-        monitor = sct.monitors[1]
-        screenshot = sct.grab(
-            monitor
-        )  # implemented using C/C++ so only accepts positional arguments
+    # zero-copy: OpenCV only copies the (much smaller) HUD ROIs it converts
+    return _CAPTURER.grab()
+
 
-        return cv2.cvtColor(src=np.array(screenshot), code=cv2.COLOR_BGRA2BGR)
+def capture_screen_gray() -> MatLike:
+    """Captures a single grayscale frame from the primary monitor.
 
+    For consumers that only need luminance: the frame is converted from the
+    MSS BGRA buffer in one OpenCV pass, without an intermediate BGR frame.
 
-def show_screen_capture() -> None:
+    Returns:
+        MatLike: Screenshot frame as a contiguous (H, W) uint8 array.
+
+    Example:
+        >>> gray = capture_screen_gray()
+        >>> print(f"Frame shape: {gray.shape}")
+        Frame shape: (1440, 2560)
+    """
+    return _CAPTURER.grab_gray()
+
+
+class CaptureThread(threading.Thread):
+    """Captures frames on a background thread so capture overlaps analysis.
+
+    The producer grabs the primary monitor into preallocated contiguous BGR
+    buffers, reused for the whole session, and publishes the newest one;
+    `read()` hands it to the consumer. Since MSS and OpenCV both release the
+    GIL, capture latency hides behind detection latency.
+
+    The consumer may keep its last `held_frames` reads alive (the analysis loop
+    holds the previous and the current frame), so one extra buffer is allocated
+    for the producer and it never writes into a frame that is still in use.
+    Unread frames are overwritten by newer ones, stale frames are never queued.
+    Grabs are paced to one per `period_ns` so no frame is captured just to be
+    thrown away. If capturing fails, the producer stops and `read()` re-raises
+    its error instead of waiting forever.
+
+    Example:
+        >>> capture = CaptureThread()
+        >>> capture.start()
+        >>> frame = capture.read()
+        >>> capture.stop()
+    """
+
+    def __init__(
+        self, held_frames: int = 2, period_ns: int = CAPTURE_PERIOD_NS
+    ) -> None:
+        super().__init__(name="capture", daemon=True)
+        self._period_ns = period_ns
+        self._buffers: list[np.ndarray | None] = [None] * (held_frames + 1)
+        self._held: deque[int] = deque(maxlen=held_frames)
+        self._num_slots = held_frames + 1
+        self._ready: int | None = None
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._error: Exception | None = None
+        self._finished = False
+
+    def run(self) -> None:
+        # the MSS handle is opened lazily on, and owned by, this thread
+        capturer = ScreenCapturer()
+        try:
+            next_capture_ns = time.monotonic_ns()
+            while not self._stop_event.is_set():
+                # sleep until the next frame is due, waking early on stop()
+                wait_ns = next_capture_ns - time.monotonic_ns()
+                if wait_ns > 0 and self._stop_event.wait(timeout=wait_ns / 1e9):
+                    break
+                next_capture_ns = time.monotonic_ns() + self._period_ns
+
+                with self._cond:
+                    slot = self._free_slot()
+
+                # BGRA -> BGR straight into the slot, allocated on first use only
+                self._buffers[slot] = capturer.grab_into(dst=self._buffers[slot])
+
+                with self._cond:
+                    self._ready = slot
+                    self._cond.notify_all()
+        except Exception as exc:
+            logger.error("Screen capture failed: {}", exc)
+            self._error = exc
+        finally:
+            capturer.close()
+            # wake readers, nothing will be published anymore
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+
+    def _free_slot(self) -> int:
+        # prefer a slot that is neither held nor waiting to be read,
+        # otherwise overwrite the unread frame with a newer one
+        free = [i for i in range(self._num_slots) if i not in self._held]
+        idle = [i for i in free if i != self._ready]
+        if idle:
+            return idle[0]
+        self._ready = None
+        return free[0]
+
+    def read(self, timeout: float | None = None) -> MatLike:
+        """Returns the newest captured frame, blocking until one is available.
+
+        Args:
+            timeout (float | None): Seconds to wait for a frame, forever if None.
+
+        Returns:
+            MatLike: Contiguous BGR capture buffer. It is read-only for the
+            consumer and stays valid until `held_frames` further frames have
+            been read, after which the producer reuses it.
+
+        Raises:
+            TimeoutError: If no frame was captured within `timeout`.
+            RuntimeError: If the capture thread stopped before a new frame.
+            Exception: The producer's own error, if capturing failed.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._ready is not None or self._finished, timeout
+            ):
+                raise TimeoutError("no frame captured in time")
+            if self._ready is None:
+                if self._error is not None:
+                    raise self._error
+                raise RuntimeError("capture thread stopped")
+            slot = cast(int, self._ready)
+            self._ready = None
+            self._held.append(slot)
+
+        return cast(np.ndarray, self._buffers[slot])
+
+    def stop(self) -> None:
+        """Stops capturing and waits for the thread to exit."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+
+def show_screen_capture(period_ns: int = 33_000_000) -> None:
     """Continuously captures and displays the screen until '~' is pressed.
 
     Creates a live preview window showing real-time screen capture.
     Useful for testing capture functionality and positioning detection regions.
     The window will close when the '~' key is pressed.
 
+    Args:
+        period_ns (int): Minimum time between two captures, in nanoseconds.
+            The window keeps polling keys in between without grabbing.
+
     Raises:
         Exception: If screen capture or window display fails.
 
@@ -57,14 +272,18 @@ def show_screen_capture() -> None:
     try:
         logger.info("Starting screen capture. Press '~' to exit...")
 
+        next_capture_ns = time.monotonic_ns()
         while True:
-            frame = capture_screen()
+            # only grab when a frame is due, otherwise just service the UI
+            if time.monotonic_ns() >= next_capture_ns:
+                next_capture_ns = time.monotonic_ns() + period_ns
+                frame = capture_screen()
 
-            # Display the frame in a window
-            cv2.imshow(winname=window_name, mat=frame)
+                # Display the frame in a window
+                cv2.imshow(winname=window_name, mat=frame)
 
-            # Check for key press - increased delay helps with responsiveness
-            key = cv2.waitKey(delay=30) & 0xFF
+            # Check for key press - short delay keeps the window responsive
+            key = cv2.waitKey(delay=1) & 0xFF
 
             # exit on '~' key press
             if key == ord("~"):
@@ -9,11 +9,23 @@ Constants:
     VARIANCE_THRESHOLD (int): Minimum variance for valid agent icon regions (800)
     MATCH_THRESHOLD (float): Template matching confidence threshold (0.9)
     KILL_FEED_TRIGGER (str): Text trigger for death detection ("KILLED BY")
+    ROI_* (tuple[int, int, int, int]): HUD regions as (x1, y1, x2, y2), calibrated
+        for REFERENCE_RESOLUTION and scaled to the actual frame size
 """
 
+import copy
+import functools
+import hashlib
+import os
+import string
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from enum import Enum
 from importlib.resources import files
-from typing import Any, NamedTuple, TypedDict, cast
+from importlib.resources.abc import Traversable
+from pathlib import Path
+from typing import Any, Generic, NamedTuple, TypedDict, TypeVar, cast
 
 import cv2
 import easyocr
@@ -24,11 +36,51 @@ from loguru import logger
 from pydantic import BaseModel, ValidationError
 
 import src.assets.agent_icons_clean as icons
+from src.assets.agent_icons_clean import TEMPLATE_ARRAYS
 
 VARIANCE_THRESHOLD = 800
 MATCH_THRESHOLD = 0.9
 KILL_FEED_TRIGGER = "KILLED BY"
 
+# (width, height) the HUD regions below were calibrated on
+REFERENCE_RESOLUTION = (1920, 1080)
+
+# HUD regions of interest, (x1, y1, x2, y2)
+ROI_KILL_FEED = (1350, 90, 1900, 300)
+ROI_DEATH_BANNER = (1510, 280, 1900, 320)  # "KILLED BY" header of the death report
+ROI_SCORE_TEAM1 = (800, 30, 845, 70)
+ROI_SCORE_TEAM2 = (1080, 30, 1125, 70)
+ROI_SCORES = (800, 30, 1125, 70)
+ROI_ROUND_STATE = (800, 140, 1145, 275)
+ROI_AGENT_ICONS = (435, 30, 1488, 80)
+
+FRAME_CACHE_SIZE = 4
+
+# mean absolute pixel difference (0-255) above which an ROI counts as changed
+ROI_CHANGE_THRESHOLD = 4.0
+
+# CPU threads for OpenCV and torch OCR. Both run on the analysis thread one after
+# the other, never at once, so they share every core except the one left to capture
+DETECTION_THREADS = max(1, (os.cpu_count() or 1) - 1)
+
+# opt-in: compile the OCR recognizer with torch.compile when running on GPU
+TORCH_COMPILE_OCR = os.getenv("OVERHEAT_TORCH_COMPILE", "0") == "1"
+
+# every region OCR'd by a detector, their shapes are fixed per resolution
+OCR_ROIS = (
+    ROI_KILL_FEED,
+    ROI_DEATH_BANNER,
+    ROI_SCORE_TEAM1,
+    ROI_SCORE_TEAM2,
+    ROI_ROUND_STATE,
+)
+
+# characters the OCR recognizer may emit per HUD region, pruning its decoder
+SCORE_ALLOWLIST = "0123456789"
+ROUND_STATE_ALLOWLIST = string.ascii_letters + " "
+
+T = TypeVar("T")
+
 
 class OcrResult(BaseModel):
     bbox: list[list[float]]
@@ -39,6 +91,7 @@ class OcrResult(BaseModel):
 class KillFeedLine(TypedDict):
     killer: str
     victim: str
+    victim_hash: int  # name_hash(victim), compared instead of the string
     was_team_death: bool
 
 
@@ -66,12 +119,210 @@ MATCH_MAP = {
 }
 
 
+def scale_roi(
+    roi: tuple[int, int, int, int], frame: MatLike
+) -> tuple[int, int, int, int]:
+    """Scales a REFERENCE_RESOLUTION region to the resolution of `frame`."""
+    height, width = frame.shape[:2]
+    ref_width, ref_height = REFERENCE_RESOLUTION
+    if (width, height) == REFERENCE_RESOLUTION:
+        return roi
+
+    x1, y1, x2, y2 = roi
+    sx, sy = width / ref_width, height / ref_height
+    return (round(x1 * sx), round(y1 * sy), round(x2 * sx), round(y2 * sy))
+
+
+def crop_roi(frame: MatLike, roi: tuple[int, int, int, int]) -> MatLike:
+    """Returns the `roi` tile of `frame` as a numpy view (no pixels are copied).
+
+    Detectors crop first and only then convert/threshold/match, so they never
+    touch the ~95% of the frame that holds no HUD information.
+    """
+    x1, y1, x2, y2 = scale_roi(roi=roi, frame=frame)
+    return frame[y1:y2, x1:x2]
+
+
+def regions_differ(
+    prev_region: MatLike, region: MatLike, threshold: float = ROI_CHANGE_THRESHOLD
+) -> bool:
+    """Cheaply checks whether two crops of the same HUD region differ materially.
+
+    Used as a gate in front of the OCR detectors: a single SIMD absdiff + sum over
+    a small tile costs microseconds, while an OCR pass costs hundreds of ms.
+
+    Args:
+        prev_region (MatLike): Earlier crop of the region, e.g. a kept copy.
+        region (MatLike): Current crop of the region.
+        threshold (float): Mean absolute difference per pixel channel.
+
+    Returns:
+        bool: True if the mean absolute difference exceeds `threshold`. Regions
+        of different shapes (e.g. after a resolution change) always differ.
+    """
+    if prev_region.shape != region.shape:
+        return True
+    diff = cv2.absdiff(prev_region, region)
+    return sum(cv2.sumElems(diff)) / diff.size > threshold
+
+
+class _FrameCached(Generic[T]):
+    """A detector memoized on the pixels of the region it reads.
+
+    Results are keyed by a digest of the ROI bytes rather than the frame's
+    identity, so a frame that is analyzed several times per tick (e.g. as
+    ``cur_frame`` and again inside ``FrameState``) only runs the detector once,
+    and a reused capture buffer can never return a stale result.
+
+    Every call returns its own copy of the cached result, so a caller mutating
+    it (e.g. sorting an agent list) can't corrupt what later callers get.
+
+    Attributes:
+        hits (int): Calls answered from the cache.
+        misses (int): Calls that ran the detector.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[MatLike], T],
+        roi: tuple[int, int, int, int],
+        maxsize: int = FRAME_CACHE_SIZE,
+    ) -> None:
+        functools.update_wrapper(self, func)
+        self._func = func
+        self._roi = roi
+        self._maxsize = maxsize
+        self._cache: OrderedDict[bytes, T] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, frame: MatLike) -> T:
+        region = np.ascontiguousarray(crop_roi(frame=frame, roi=self._roi))
+        key = hashlib.blake2b(region, digest_size=16).digest()
+        key += repr(region.shape).encode()
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._cache[key])
+
+        result = self._func(frame)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = result
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return copy.deepcopy(result)
+
+    def cache_clear(self) -> None:
+        """Drops every cached result and resets the hit/miss counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+
+def _frame_cache(
+    roi: tuple[int, int, int, int], maxsize: int = FRAME_CACHE_SIZE
+) -> Callable[[Callable[[MatLike], T]], _FrameCached[T]]:
+    """Memoizes a detector on the pixels of `roi`, see `_FrameCached`.
+
+    Args:
+        roi (tuple[int, int, int, int]): Region the detector reads, (x1, y1, x2, y2).
+        maxsize (int): Number of most recent results kept per detector.
+    """
+
+    def decorator(func: Callable[[MatLike], T]) -> _FrameCached[T]:
+        return _FrameCached(func=func, roi=roi, maxsize=maxsize)
+
+    return decorator
+
+
+_READER: easyocr.Reader | None = None
+_READER_LOCK = threading.Lock()
+
+
+def _get_reader() -> easyocr.Reader:
+    """Returns the shared EasyOCR reader, loading its models on first use.
+
+    Building a reader loads the detection and recognition weights onto the
+    device, which takes seconds, so every OCR detector shares one instance.
+    On GPU, cuDNN autotuning is enabled and a warmup OCRs rendered text once
+    per OCR region shape, so the first real frames don't pay for tuning the
+    detector. With TORCH_COMPILE_OCR the recognizer is also compiled: the
+    warmup compiles it for the text crops it renders, but crops of other
+    widths can still trigger a recompile on the first frames that have them.
+    """
+    global _READER
+    if _READER is None:
+        with _READER_LOCK:
+            # another thread may have built it while we waited
+            if _READER is None:
+                use_gpu = torch.cuda.is_available()
+                if not use_gpu:
+                    # leave cores for the capture and analysis threads
+                    torch.set_num_threads(DETECTION_THREADS)
+                # easyocr sets torch.backends.cudnn.benchmark from this flag
+                reader = easyocr.Reader(
+                    lang_list=["en"], gpu=use_gpu, cudnn_benchmark=use_gpu
+                )
+                if use_gpu and TORCH_COMPILE_OCR:
+                    reader.recognizer = torch.compile(
+                        reader.recognizer, mode="reduce-overhead"
+                    )
+                if use_gpu:
+                    _warmup_reader(reader=reader)
+                _READER = reader
+    return _READER
+
+
+def _warmup_image(shape: tuple[int, int]) -> np.ndarray:
+    # white text on black sized to the region, so the detector finds a box and
+    # the recognizer runs on it (a blank image never reaches the recognizer)
+    height, width = shape
+    text = KILL_FEED_TRIGGER if width >= 4 * height else "8"
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (text_width, text_height), _ = cv2.getTextSize(text, font, 1.0, 2)
+    scale = min(0.6 * height / text_height, 0.9 * width / text_width)
+
+    image = np.zeros(shape, dtype=np.uint8)
+    cv2.putText(
+        img=image,
+        text=text,
+        org=(int(0.05 * width), int((height + text_height * scale) / 2)),
+        fontFace=font,
+        fontScale=scale,
+        color=255,
+        thickness=2,
+    )
+    return image
+
+
+def _warmup_reader(reader: easyocr.Reader) -> None:
+    # the OCR'd regions have fixed sizes: tune the detector's conv kernels for
+    # each once, and run the recognizer on the text crops it finds. Recognizer
+    # inputs vary with the text width, so other widths may still tune on first use
+    shapes = {(y2 - y1, x2 - x1) for x1, y1, x2, y2 in OCR_ROIS}
+    for shape in shapes:
+        reader.readtext(_warmup_image(shape=shape), detail=0)
+
+
+def name_hash(name: str) -> int:
+    """Case-insensitive player name hash, computed once per name.
+
+    Kill feed victims are hashed at detection time and the monitored player once
+    per lookup, so matching a victim is a single int comparison.
+    """
+    return hash(name.lower())
+
+
 def classify_team_death_event(patch: MatLike) -> bool:
-    mean_color = patch.mean(axis=(0, 1))
-    blue, green, red = mean_color
+    # cv2.mean returns plain floats (B, G, R, A), no np.bool_ to cast
+    blue, green, red, _ = cv2.mean(patch)
 
-    # we force cast that fucky np.bool_ to python bool
-    return bool(red <= max(blue, green) * 1.2)
+    return red <= max(blue, green) * 1.2
 
 
 def crop_patch(roi: MatLike, bbox: list[list[float]]) -> MatLike:
@@ -80,17 +331,15 @@ def crop_patch(roi: MatLike, bbox: list[list[float]]) -> MatLike:
     return roi[int(min(ys)) : int(max(ys)), int(min(xs)) : int(max(xs))]
 
 
+@_frame_cache(roi=ROI_KILL_FEED)
 def detect_kill_feed(frame: MatLike) -> list[KillFeedLine]:
     # region of interest
-    roi_x_min, roi_y_min = 1350, 90
-    roi_x_max, roi_y_max = 1900, 300
-    roi_color = frame[roi_y_min:roi_y_max, roi_x_min:roi_x_max]
+    roi_color = crop_roi(frame=frame, roi=ROI_KILL_FEED)
 
     # OCR works better on grayscale
     gray_roi = cv2.cvtColor(src=roi_color, code=cv2.COLOR_BGR2GRAY)
 
-    # intialize easyOCR reader
-    reader = easyocr.Reader(lang_list=["en"], gpu=torch.cuda.is_available())
+    reader = _get_reader()
 
     raw_ocr = cast(
         list[tuple[list[list[float]], str, float]],
@@ -117,6 +366,7 @@ def detect_kill_feed(frame: MatLike) -> list[KillFeedLine]:
         KillFeedLine(
             killer=ocr_res[i].text,
             victim=ocr_res[i + 1].text,
+            victim_hash=name_hash(ocr_res[i + 1].text),
             was_team_death=classify_team_death_event(
                 patch=crop_patch(
                     roi_color,
@@ -128,11 +378,12 @@ def detect_kill_feed(frame: MatLike) -> list[KillFeedLine]:
     ]
 
 
+@_frame_cache(roi=ROI_DEATH_BANNER)
 def is_player_dead(frame: MatLike) -> bool:
     """Detects if the player is currently dead.
 
-    Scans the kill feed region for the "KILLED BY" trigger text which appears
-    when the player has been eliminated. Uses OCR to analyze the text content
+    Scans the header of the death report for the "KILLED BY" trigger text
+    which appears when the player has been eliminated. Uses OCR to analyze the text content
     in the designated region of interest.
 
     Args:
@@ -142,50 +393,272 @@ def is_player_dead(frame: MatLike) -> bool:
         bool: True if player is dead (KILLED BY text found), False otherwise.
 
     Note:
-        - Detection region: (1420, 220) to (1900, 800)
+        - Detection region: ROI_DEATH_BANNER, (1510, 280) to (1900, 320)
+        - Only the header strip is OCR'd, at full resolution: the trigger text
+          is small, so the strip is cropped tightly rather than downscaled
         - Uses grayscale conversion for improved OCR performance
         - Searches for KILL_FEED_TRIGGER constant in detected text
     """
     # region of interest
-    x1, y1 = 1420, 220  # top left
-    x2, y2 = 1900, 800  # bottom right
-    roi = frame[y1:y2, x1:x2]
+    roi = crop_roi(frame=frame, roi=ROI_DEATH_BANNER)
 
     gray_roi = cv2.cvtColor(src=roi, code=cv2.COLOR_BGR2GRAY)
 
-    # intialize easyOCR reader
-    reader = easyocr.Reader(lang_list=["en"], gpu=torch.cuda.is_available())
+    reader = _get_reader()
 
     text_res = cast(list[str], reader.readtext(image=gray_roi, detail=0))
-    logger.debug(f"easyocr reader found {text_res=}")
+    logger.debug("easyocr reader found text_res={}", text_res)
 
     # check for existance of 'KILLED BY'
     return any(KILL_FEED_TRIGGER in text for text in text_res)
 
 
+@_frame_cache(roi=ROI_SCORES)
 def detect_scores(frame: MatLike) -> Scores:
     def extract_score(
         roi: tuple[int, int, int, int],
     ):
-        x1, y1, x2, y2 = roi
-        subframe = frame[y1:y2, x1:x2]
+        subframe = crop_roi(frame=frame, roi=roi)
         gray_roi = cv2.cvtColor(src=subframe, code=cv2.COLOR_BGR2GRAY)
-        # intialize easyOCR reader
-        reader = easyocr.Reader(
-            lang_list=["en"], gpu=torch.cuda.is_available()
-        )  # set gpu = True if have gpu
+        reader = _get_reader()
 
-        text_res = cast(list[str], reader.readtext(gray_roi, detail=0))
-        logger.debug(f"{text_res=}")
+        text_res = cast(
+            list[str],
+            reader.readtext(gray_roi, detail=0, allowlist=SCORE_ALLOWLIST),
+        )
+        logger.debug("text_res={}", text_res)
 
         return int(text_res[0])
 
     return Scores(
-        team1=extract_score(roi=(800, 30, 845, 70)),
-        team2=extract_score(roi=(1080, 30, 1125, 70)),
+        team1=extract_score(roi=ROI_SCORE_TEAM1),
+        team2=extract_score(roi=ROI_SCORE_TEAM2),
+    )
+
+
+class TemplateBank(NamedTuple):
+    """Agent icon templates of one team, stacked for a single fused match."""
+
+    names: list[str]
+    weighted: np.ndarray  # (agents, h * w) template * mask
+    mask: np.ndarray  # (agents, h * w) binary mask
+    norms: np.ndarray  # (agents,) sqrt(sum((template * mask)^2))
+    shape: tuple[int, int]  # (h, w) of every template
+
+
+def _read_template(path: Traversable) -> np.ndarray | None:
+    # files on disk are decoded by OpenCV straight from the path, resources that
+    # are not (e.g. inside a zipimport) or that imread can't open go via bytes
+    if isinstance(path, Path):
+        agent_template = cv2.imread(filename=str(path), flags=cv2.IMREAD_UNCHANGED)
+        if agent_template is not None:
+            return agent_template
+
+    with path.open("rb") as template_file:
+        return cv2.imdecode(
+            buf=np.frombuffer(template_file.read(), np.uint8),
+            flags=cv2.IMREAD_UNCHANGED,
+        )
+
+
+def _agent_name(file_name: str) -> str:
+    return file_name.replace("Mirrored_", "").replace("_icon.webp", "")
+
+
+def _load_template_arrays(
+    is_mirrored: bool, expected_names: list[str]
+) -> np.ndarray | None:
+    # prebuilt arrays are only trusted while they list exactly the icons on disk
+    array_path = files(icons).joinpath(f"{TEMPLATE_ARRAYS[is_mirrored]}.npy")
+    names_path = files(icons).joinpath(f"{TEMPLATE_ARRAYS[is_mirrored]}.txt")
+    if not (isinstance(array_path, Path) and array_path.is_file()):
+        return None
+    if not names_path.is_file() or names_path.read_text().split() != expected_names:
+        logger.warning(f"{array_path.name} is stale, decoding the agent icons instead")
+        return None
+
+    return np.load(file=array_path, mmap_mode="r")
+
+
+def _decode_templates(
+    paths: list[Traversable],
+) -> tuple[list[str], np.ndarray]:
+    # (agents, 2, h, w): grayscale and alpha of every icon that decoded
+    names: list[str] = []
+    decoded: list[np.ndarray] = []
+    for path in paths:
+        agent_name = _agent_name(path.name)
+        try:
+            agent_template = _read_template(path=path)
+        except Exception as error:
+            logger.error(f"Error loading {agent_name} template {error=}")
+            continue
+        if agent_template is None:
+            logger.error(f"Error loading {agent_name} template, could not decode")
+            continue
+
+        gray = cv2.cvtColor(src=agent_template[:, :, :3], code=cv2.COLOR_BGR2GRAY)
+        names.append(agent_name)
+        decoded.append(np.stack([gray, agent_template[:, :, 3]]))
+    return names, np.stack(decoded)
+
+
+def _build_bank(names: list[str], templates: np.ndarray) -> TemplateBank:
+    # masking to avoid the background of template influencing match
+    grays = templates[:, 0].astype(np.float32)
+    alphas = templates[:, 1]
+    # like matchTemplate, a uint8 mask is binary: any alpha > 0 counts
+    masks = (alphas > 0).astype(np.float32)
+    flat_masks = masks.reshape(len(names), -1)
+    return TemplateBank(
+        names=names,
+        weighted=grays.reshape(len(names), -1) * flat_masks,
+        mask=flat_masks,
+        norms=np.sqrt(np.square(grays * masks).sum(axis=(1, 2))),
+        shape=(grays.shape[1], grays.shape[2]),
     )
 
 
+def _load_templates() -> dict[bool, TemplateBank]:
+    """Loads every agent icon once, keyed by whether it is mirrored (team 2).
+
+    Icons come from the prebuilt TEMPLATE_ARRAYS when they are present and
+    match the icons on disk, otherwise each icon is decoded. Templates are
+    grayscale, stacked together with their alpha masks into one
+    TemplateBank per team, so detect_agent_icons never touches the filesystem.
+    """
+    paths: dict[bool, list[Traversable]] = {False: [], True: []}
+    for path in sorted(files(icons).iterdir(), key=lambda path: path.name):
+        if path.name.endswith(".webp"):
+            paths[path.name.startswith("Mirrored_")].append(path)
+
+    banks: dict[bool, TemplateBank] = {}
+    for is_mirrored, team_paths in paths.items():
+        names = [_agent_name(path.name) for path in team_paths]
+        templates = _load_template_arrays(is_mirrored=is_mirrored, expected_names=names)
+        if templates is None:
+            names, templates = _decode_templates(paths=team_paths)
+        banks[is_mirrored] = _build_bank(names=names, templates=templates)
+    return banks
+
+
+_TEMPLATES = _load_templates()
+
+
+def _match_scores(rois: list[np.ndarray], bank: TemplateBank) -> np.ndarray:
+    """Matches every slot against every template of a bank in one pass.
+
+    Computes the masked TM_CCORR_NORMED score of cv2.matchTemplate for every
+    (slot, position, template) triple with two matrix products, instead of one
+    matchTemplate call per slot and template. Slots are matched at full
+    resolution: halving it shrinks the gap to the runner-up agent so far that
+    wrong agents clear MATCH_THRESHOLD too.
+
+    Args:
+        rois (list[np.ndarray]): Grayscale icon slots, all of the same shape.
+        bank (TemplateBank): Templates to match the slots against.
+
+    Returns:
+        np.ndarray: (slots, agents) best score of every template per slot.
+    """
+    # (slots, positions, h * w) windows over the slots
+    slots = np.stack(rois).astype(np.float32)
+    windows = np.lib.stride_tricks.sliding_window_view(
+        slots, window_shape=bank.shape, axis=(1, 2)
+    ).reshape(len(rois), -1, bank.shape[0] * bank.shape[1])
+
+    # sum(I * T * M) / sqrt(sum(I^2 * M) * sum(T^2 * M)) for a binary mask M
+    numerator = windows @ bank.weighted.T
+    denominator = np.sqrt(np.square(windows) @ bank.mask.T) * bank.norms
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros_like(numerator),
+        where=denominator > 0,
+    ).max(axis=1)  # best position per template
+
+
+def _best_matches(
+    rois: list[np.ndarray], bank: TemplateBank
+) -> list[tuple[str, float]]:
+    """Best template of a bank for every slot, see `_match_scores`.
+
+    Args:
+        rois (list[np.ndarray]): Grayscale icon slots, all of the same shape.
+        bank (TemplateBank): Templates to match the slots against.
+
+    Returns:
+        list[tuple[str, float]]: Best (agent name, score) per slot, ("", 0.0)
+        if no template reaches MATCH_THRESHOLD.
+    """
+    if not rois:
+        return []
+
+    matches: list[tuple[str, float]] = []
+    for slot_scores in _match_scores(rois=rois, bank=bank):
+        best = int(np.argmax(slot_scores))
+        max_val = float(slot_scores[best])
+        matches.append(
+            (bank.names[best], max_val) if max_val >= MATCH_THRESHOLD else ("", 0.0)
+        )
+    return matches
+
+
+def _detect_team(
+    gray_strip: np.ndarray,
+    start_xy: tuple[int, int],
+    stride_x: int,
+    bank: TemplateBank,
+) -> list[str]:
+    """Identifies the alive agents of one team on the grayscale icon strip.
+
+    Args:
+        gray_strip (np.ndarray): ROI_AGENT_ICONS strip in grayscale, at the
+            reference resolution.
+        start_xy (tuple[int, int]): Top left of the first slot, relative to
+            the strip.
+        stride_x (int): Horizontal offset from one slot to the next.
+        bank (TemplateBank): Templates of this team's icon orientation.
+
+    Returns:
+        list[str]: Lowercase agent names of the non-empty slots, "" for a slot
+        no template matched.
+    """
+    x1, y1 = start_xy
+    y2 = y1 + 50
+    rois: list[np.ndarray] = []
+    for _ in range(5):
+        x2 = x1 + 65
+        roi = cast(np.ndarray[Any, Any], gray_strip[y1:y2, x1:x2])
+        # handle empty ROI (dead agents)
+        # one SIMD pass instead of np.var's mean + squared deviations passes
+        _, stddev = cv2.meanStdDev(roi)
+        variance = float(stddev[0, 0]) ** 2
+        if variance < VARIANCE_THRESHOLD:
+            logger.debug(
+                "variance: {} is too low, empty ROI: Top-left({}, {}) "
+                "Bottom-right({}, {})",
+                variance,
+                x1,
+                y1,
+                x2,
+                y2,
+            )
+        else:
+            rois.append(roi)
+        x1 += stride_x
+
+    # every alive slot of the team is matched in one pass
+    agents: list[str] = []
+    for ret_agent, ret_threshold in _best_matches(rois=rois, bank=bank):
+        logger.debug(
+            "ret_agent={!r} added, with ret_threshold={}", ret_agent, ret_threshold
+        )
+        agents.append(ret_agent.lower())
+    return agents
+
+
+@_frame_cache(roi=ROI_AGENT_ICONS)
 def detect_agent_icons(frame: MatLike) -> tuple[list[str], list[str]]:
     """Detects agent compositions for both teams using template matching.
 
@@ -202,180 +675,57 @@ def detect_agent_icons(frame: MatLike) -> tuple[list[str], list[str]]:
         if agents are dead (empty regions detected).
 
     Note:
+        - Only the ROI_AGENT_ICONS strip is converted and matched
         - Team 1 region: starts at (435, 30), moves right by 65px per agent
         - Team 2 region: starts at (1423, 30), moves left by 65px per agent
         - Uses VARIANCE_THRESHOLD to skip empty regions (dead agents)
+        - Templates are preloaded; slots and templates are matched at
+          full resolution, all slots of a team in one pass
         - Template matching threshold: MATCH_THRESHOLD (0.9)
         - Agent names returned in lowercase and sorted alphabetically
     """
-    assets_folder = files(icons)
-
-    # convert frame to grayscale
-    gray_frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGR2GRAY)
-
-    # team 1
-    team1_agents: list[str] = []
-
-    # intial ROI
-    x1, y1 = 435, 30  # top left
-    x2, y2 = 500, 80  # bottom right
-
-    for _ in range(5):
-        roi = cast(np.ndarray[Any, Any], gray_frame[y1:y2, x1:x2])
-        # handle empty ROI (dead agents)
-        if np.var(roi) < VARIANCE_THRESHOLD:
-            roi_str = f"Top-left({x1}, {y1}) Bottom-right({x2}, {y2})"
-            logger.debug(f"variance: {np.var(roi)} is too low, empty ROI: {roi_str}")
-            x1 += 65
-            x2 += 65
-            continue
-
-        ret_agent = ""
-        ret_threshold = 0
-        for path in assets_folder.iterdir():
-            if path.name.endswith(".webp"):
-                is_mirrored = path.name.startswith("Mirrored_")
-
-                if is_mirrored:
-                    continue
-
-                # load agent icon and get agent name
-                agent_name = path.name.replace("Mirrored_", "").replace(
-                    "_icon.webp", ""
-                )
-                try:
-                    # load template using imdecode
-                    with path.open("rb") as template_file:
-                        agent_template = cv2.imdecode(
-                            buf=np.frombuffer(template_file.read(), np.uint8),
-                            flags=cv2.IMREAD_UNCHANGED,
-                        )
-                except Exception as error:
-                    logger.error(f"Error loading {agent_name} template {error=}")
-                    continue
-
-                # random masking to avoid the background of template influencing match
-                agent_template, alpha = (
-                    agent_template[:, :, :3],
-                    agent_template[:, :, 3],
-                )
-                agent_template = cv2.cvtColor(
-                    src=agent_template, code=cv2.COLOR_BGR2GRAY
-                )
-                mask = alpha
-
-                # template match
-                result = cv2.matchTemplate(
-                    image=roi,
-                    templ=agent_template,
-                    method=cv2.TM_CCORR_NORMED,
-                    mask=mask,
-                )
-                loc = np.where(result >= MATCH_THRESHOLD)
-                # update max match
-                if loc[0].size > 0:
-                    max_val = np.max(result)
-                    if max_val >= MATCH_THRESHOLD:
-                        if max_val > ret_threshold:
-                            ret_threshold = max_val
-                            ret_agent = agent_name
-        logger.debug(f"{ret_agent=} added to team1, with {ret_threshold=}")
-        team1_agents.append(ret_agent.lower())
-        x1 += 65
-        x2 += 65
-
-    # team 2
-    team2_agents: list[str] = []
-
-    # intial ROI
-    x1, y1 = 1423, 30  # top left
-    x2, y2 = 1488, 80  # bottom right
-
-    for _ in range(5):
-        roi = cast(np.ndarray[Any, Any], gray_frame[y1:y2, x1:x2])
-        # handle empty ROI (dead agents)
-        if np.var(roi) < VARIANCE_THRESHOLD:
-            roi_str = f"Top-left({x1}, {y1}) Bottom-right({x2}, {y2})"
-            logger.debug(f"variance: {np.var(roi)} is too low, empty ROI: {roi_str}")
-            x1 -= 65
-            x2 -= 65
-            continue
-
-        ret_agent = ""
-        ret_threshold = 0
-        for path in assets_folder.iterdir():
-            if path.name.endswith(".webp"):
-                is_mirrored = path.name.startswith("Mirrored_")
-
-                if not is_mirrored:
-                    continue
-
-                # load agent icon and get agent name
-                agent_name = path.name.replace("Mirrored_", "").replace(
-                    "_icon.webp", ""
-                )
-                try:
-                    # load template using imdecode
-                    with path.open("rb") as template_file:
-                        agent_template = cv2.imdecode(
-                            buf=np.frombuffer(template_file.read(), np.uint8),
-                            flags=cv2.IMREAD_UNCHANGED,
-                        )
-                except Exception as error:
-                    logger.error(f"Error loading {agent_name} template {error=}")
-                    continue
-
-                # random masking to avoid the background of template influencing match
-                agent_template, alpha = (
-                    agent_template[:, :, :3],
-                    agent_template[:, :, 3],
-                )
-                agent_template = cv2.cvtColor(
-                    src=agent_template, code=cv2.COLOR_BGR2GRAY
-                )
-                mask = alpha
-
-                # template match
-                result = cv2.matchTemplate(
-                    image=roi,
-                    templ=agent_template,
-                    method=cv2.TM_CCORR_NORMED,
-                    mask=mask,
-                )
-                loc = np.where(result >= MATCH_THRESHOLD)
-
-                # update max match
-                if loc[0].size > 0:
-                    max_val = np.max(result)
-                    if max_val >= MATCH_THRESHOLD:
-                        if max_val > ret_threshold:
-                            ret_threshold = max_val
-                            ret_agent = agent_name
-
-        logger.debug(f"{ret_agent=} added to team2, with {ret_threshold=}")
-        team2_agents.append(ret_agent.lower())
-        x1 -= 65
-        x2 -= 65
+    # crop the icon strip, templates are sized for the reference resolution
+    strip_x1, strip_y1, strip_x2, strip_y2 = ROI_AGENT_ICONS
+    strip = crop_roi(frame=frame, roi=ROI_AGENT_ICONS)
+    strip_size = (strip_x2 - strip_x1, strip_y2 - strip_y1)
+    if (strip.shape[1], strip.shape[0]) != strip_size:
+        strip = cv2.resize(src=strip, dsize=strip_size, interpolation=cv2.INTER_AREA)
+
+    # convert only the strip to grayscale
+    gray_frame = cv2.cvtColor(src=strip, code=cv2.COLOR_BGR2GRAY)
+
+    # team 1 starts at the left edge and moves right, team 2 mirrors it
+    team1_agents = _detect_team(
+        gray_strip=gray_frame,
+        start_xy=(435 - strip_x1, 30 - strip_y1),
+        stride_x=65,
+        bank=_TEMPLATES[False],
+    )
+    team2_agents = _detect_team(
+        gray_strip=gray_frame,
+        start_xy=(1423 - strip_x1, 30 - strip_y1),
+        stride_x=-65,
+        bank=_TEMPLATES[True],
+    )
 
     # sort the agents for easier testing
     return (sorted(team1_agents), sorted(team2_agents))
 
 
+@_frame_cache(roi=ROI_ROUND_STATE)
 def detect_round_state(frame: MatLike) -> RoundState:
     # region of interest
-    x1, y1 = 800, 140  # top left
-    x2, y2 = 1145, 275  # bottom right
-    roi = frame[y1:y2, x1:x2]
+    roi = crop_roi(frame=frame, roi=ROI_ROUND_STATE)
 
     gray_roi = cv2.cvtColor(src=roi, code=cv2.COLOR_BGR2GRAY)
 
-    # intialize easyOCR reader
-    reader = easyocr.Reader(
-        lang_list=["en"], gpu=torch.cuda.is_available()
-    )  # set gpu = True if have gpu
+    reader = _get_reader()
 
-    text_res = cast(list[str], reader.readtext(gray_roi, detail=0))
-    logger.debug(f"easyocr reader found {text_res=}")
+    text_res = cast(
+        list[str],
+        reader.readtext(gray_roi, detail=0, allowlist=ROUND_STATE_ALLOWLIST),
+    )
+    logger.debug("easyocr reader found text_res={}", text_res)
 
     return next(
         (MATCH_MAP[word.lower()] for word in text_res if word.lower() in MATCH_MAP),
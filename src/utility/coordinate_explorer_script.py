@@ -6,6 +6,7 @@ of interest (ROI) definitions used in HUD detection. Click on the displayed
 screenshot to get coordinate information for defining detection regions.
 """
 
+import time
 from importlib.resources import files
 
 import cv2
@@ -19,17 +20,17 @@ start_x, start_y = None, None
 
 def get_coords(event: int, x: int, y: int, _flags: int, _param: object) -> None:
     """Mouse callback function to capture click coordinates.
-    
+
     Handles left mouse button clicks to record and print x, y coordinates.
     Used for identifying regions of interest in Valorant screenshots.
-    
+
     Args:
         event (int): OpenCV mouse event type.
         x (int): X-coordinate of mouse click.
         y (int): Y-coordinate of mouse click.
         _flags (int): Additional flags (unused).
         _param (object): User data (unused).
-        
+
     Note:
         Updates global variables start_x and start_y when left button is clicked.
     """
@@ -41,11 +42,12 @@ def get_coords(event: int, x: int, y: int, _flags: int, _param: object) -> None:
 
 def main() -> None:
     """Main function to run the coordinate explorer.
-    
+
     Loads a test screenshot and displays it in an interactive window.
     Users can click anywhere on the image to get coordinates printed
-    to the console. Useful for defining detection regions.
-    
+    to the console. Useful for defining detection regions. Press any key or
+    close the window to exit.
+
     Example:
         >>> main()  # Opens window with test screenshot
         # Click anywhere to see coordinates
@@ -63,7 +65,12 @@ def main() -> None:
     cv2.namedWindow("Screenshot")
     cv2.setMouseCallback("Screenshot", get_coords)
     cv2.imshow("Screenshot", image)
-    _ = cv2.waitKey(0)
+
+    # poll instead of blocking in waitKey(0), exits on any key or window close
+    while cv2.getWindowProperty("Screenshot", cv2.WND_PROP_VISIBLE) >= 1:
+        if cv2.pollKey() != -1:
+            break
+        time.sleep(0.02)
     cv2.destroyAllWindows()
 
 
@@ -0,0 +1,50 @@
+import functools
+from collections.abc import Callable
+from importlib.resources import as_file, files
+
+import cv2
+import pytest
+from cv2.typing import MatLike
+
+from src.assets import game_scenarios
+
+# resolved once, instead of walking the importlib machinery per image
+_SCENARIOS = files(game_scenarios)
+
+
+@functools.cache
+def _load_scenario(name: str) -> MatLike:
+    # load test image from assets folder
+    test_img = _SCENARIOS.joinpath(name)
+
+    # as_file only extracts to a temporary file when the assets are not on disk
+    with as_file(test_img) as img_path:
+        # libpng drops the alpha channel while decoding, straight to BGR
+        frame = cv2.imread(str(img_path), cv2.IMREAD_COLOR)
+
+    # shared by every test of the session, copy it before modifying
+    frame.flags.writeable = False
+    return frame
+
+
+@pytest.fixture(scope="session")
+def load_scenario() -> Callable[[str], MatLike]:
+    """Pytest fixture that loads game scenario frames, each decoded once.
+
+    Returns:
+        Callable[[str], MatLike]: Loader taking an image name from
+        src/assets/game_scenarios and returning the read-only BGR frame.
+    """
+    return _load_scenario
+
+
+@pytest.fixture(scope="session")
+def kill_feed_bgr() -> MatLike:
+    """Pytest fixture that provides the kill_feed_death.png frame (read-only BGR)."""
+    return _load_scenario("kill_feed_death.png")
+
+
+@pytest.fixture(scope="session")
+def mid_round_bgr() -> MatLike:
+    """Pytest fixture that provides the mid_round.png frame (read-only BGR)."""
+    return _load_scenario("mid_round.png")
@@ -0,0 +1,136 @@
+from unittest import mock
+
+import pytest
+from cv2.typing import MatLike
+
+from src.analysis import game_analyzer
+from src.detection import hud_detection
+from src.detection.hud_detection import KillFeedLine
+
+
+def _feed_line(killer: str, victim: str, was_team_death: bool) -> KillFeedLine:
+    # kill feed event as detect_kill_feed builds it, without OCR
+    return KillFeedLine(
+        killer=killer,
+        victim=victim,
+        victim_hash=hud_detection.name_hash(victim),
+        was_team_death=was_team_death,
+    )
+
+
+@pytest.mark.unit
+# test a static banner is only OCR'd again once it changes
+def test_death_gate_skips_checked_banner(
+    mid_round_bgr: MatLike, kill_feed_bgr: MatLike
+) -> None:
+    gate = game_analyzer.DeathBannerGate()
+
+    with mock.patch.object(
+        hud_detection, "is_player_dead", return_value=False
+    ) as mock_dead:
+        for frame in (mid_round_bgr, mid_round_bgr, kill_feed_bgr):
+            assert (
+                game_analyzer.check_for_death_frame(
+                    prev_frame=frame, frame=frame, player_name="Iso", gate=gate
+                )
+                is None
+            )
+
+    # first frame, then only once the banner changed
+    assert mock_dead.call_count == 2
+
+
+@pytest.mark.unit
+# test a death is found even when monitoring starts with the banner already up
+def test_death_gate_checks_first_frame(kill_feed_bgr: MatLike) -> None:
+    gate = game_analyzer.DeathBannerGate()
+
+    with (
+        mock.patch.object(hud_detection, "is_player_dead", return_value=True),
+        mock.patch.object(game_analyzer, "team_diff_at_death", return_value=0),
+    ):
+        state = game_analyzer.check_for_death_frame(
+            prev_frame=kill_feed_bgr, frame=kill_feed_bgr, player_name="Iso", gate=gate
+        )
+        assert state is not None
+        assert state.team_diff == 0
+
+        # the reported death is not reported again while the banner stays up
+        assert not gate.should_check(frame=kill_feed_bgr)
+
+
+@pytest.mark.unit
+# test a death whose team diff can't be reconstructed yet is retried
+def test_death_gate_retries_unresolved_death(kill_feed_bgr: MatLike) -> None:
+    gate = game_analyzer.DeathBannerGate()
+
+    with (
+        mock.patch.object(hud_detection, "is_player_dead", return_value=True),
+        mock.patch.object(
+            game_analyzer, "team_diff_at_death", side_effect=[-3, 0]
+        ) as mock_diff,
+    ):
+        states = [
+            game_analyzer.check_for_death_frame(
+                prev_frame=kill_feed_bgr,
+                frame=kill_feed_bgr,
+                player_name="Iso",
+                gate=gate,
+            )
+            for _ in range(2)
+        ]
+
+    # same static banner, reconstructed on the second frame
+    assert states[0] is None
+    assert states[1] is not None
+    assert states[1].team_diff == 0
+    assert mock_diff.call_count == 2
+
+
+@pytest.mark.unit
+# test the replay stops at the target's death, matched case-insensitively
+def test_walk_feed_stops_at_target() -> None:
+    kill_feed = [
+        _feed_line(killer="zlabobabil", victim="Iso", was_team_death=False),
+        _feed_line(killer="igneous rock fan", victim="zlabobabil", was_team_death=True),
+        _feed_line(killer="Iso", victim="Jett", was_team_death=False),
+    ]
+
+    # +1 for Iso, -1 for the target, the event after the target is not replayed
+    assert (
+        game_analyzer._walk_feed(
+            kill_feed=kill_feed, target_player="ZLABOBABIL", start_diff=2
+        )
+        == 2
+    )
+
+
+@pytest.mark.unit
+# test the whole feed is replayed when the target is not in it
+def test_walk_feed_without_target() -> None:
+    kill_feed = [
+        _feed_line(killer="zlabobabil", victim="Iso", was_team_death=False),
+        _feed_line(killer="Iso", victim="Jett", was_team_death=False),
+        _feed_line(killer="Jett", victim="Sova", was_team_death=True),
+    ]
+
+    assert (
+        game_analyzer._walk_feed(
+            kill_feed=kill_feed, target_player="someone else", start_diff=0
+        )
+        == 1
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(("was_team_death", "expected"), [(True, -1), (False, 1)])
+# test team deaths lower the team diff and enemy deaths raise it
+def test_walk_feed_death_direction(was_team_death: bool, expected: int) -> None:
+    kill_feed = [
+        _feed_line(killer="Jett", victim="Sova", was_team_death=was_team_death)
+    ]
+
+    assert (
+        game_analyzer._walk_feed(kill_feed=kill_feed, target_player="Iso", start_diff=0)
+        == expected
+    )
@@ -1,27 +1,20 @@
+from collections.abc import Callable
 from importlib.resources import files
 from pprint import pprint
 
 import cv2
 import numpy as np
 import pytest
+from cv2.typing import MatLike
 
-from src.assets import game_scenarios
+import src.assets.agent_icons_clean as icons
 from src.detection import hud_detection
 
 
 # test detect kill feed when kill feed contains valid events
 @pytest.mark.unit
-def test_kill_feed_detection() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("kill_feed_death.png")
-
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
-
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
+def test_kill_feed_detection(kill_feed_bgr: MatLike) -> None:
+    frame = kill_feed_bgr
 
     kill_feed = hud_detection.detect_kill_feed(frame)
     pprint(kill_feed)
@@ -39,51 +32,24 @@ def test_kill_feed_detection() -> None:
 
 # test check killed by exists positive test
 @pytest.mark.unit
-def test_check_killed_by_pos() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("kill_feed_death.png")
-
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
-
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
+def test_check_killed_by_pos(kill_feed_bgr: MatLike) -> None:
+    frame = kill_feed_bgr
 
     assert hud_detection.is_player_dead(frame)
 
 
 @pytest.mark.unit
 # test check killed by exists negative test
-def test_check_killed_by_neg() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("mid_round.png")
-
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
-
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
+def test_check_killed_by_neg(mid_round_bgr: MatLike) -> None:
+    frame = mid_round_bgr
 
     assert not hud_detection.is_player_dead(frame)
 
 
 @pytest.mark.unit
 # test detect scores
-def test_detect_round_info() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("mid_round.png")
-
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
-
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
+def test_detect_round_info(mid_round_bgr: MatLike) -> None:
+    frame = mid_round_bgr
 
     scores = hud_detection.detect_scores(frame)
     assert scores.team1 == 8
@@ -92,18 +58,8 @@ def test_detect_round_info() -> None:
 
 @pytest.mark.unit
 # test team agent detection with deaths
-def test_agent_detection_with_deaths() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("kill_feed_death.png")
-
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
-
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
-
+def test_agent_detection_with_deaths(kill_feed_bgr: MatLike) -> None:
+    frame = kill_feed_bgr
     ret = hud_detection.detect_agent_icons(frame)
 
     assert ret[0] == ["cypher", "skye"]
@@ -114,18 +70,8 @@ def test_agent_detection_with_deaths() -> None:
 
 @pytest.mark.unit
 # test team agent detection no deaths
-def test_agent_detection_no_deaths() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("mid_round.png")
-
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
-
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
-
+def test_agent_detection_no_deaths(mid_round_bgr: MatLike) -> None:
+    frame = mid_round_bgr
     ret = hud_detection.detect_agent_icons(frame)
 
     assert ret[0] == sorted(["clove", "neon", "killjoy", "reyna", "jett"])
@@ -134,81 +80,165 @@ def test_agent_detection_no_deaths() -> None:
     assert len(ret[1]) == 5
 
 
-@pytest.mark.skip
-def test_detect_round_state_buy_phase() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("pre_round_buy_phase.png")
+@pytest.mark.unit
+# test agent detection is memoized on the pixels of its ROI
+def test_agent_detection_cached_per_frame(mid_round_bgr: MatLike) -> None:
+    # the session frame is shared, mutate a copy
+    frame = mid_round_bgr.copy()
+    detect = hud_detection.detect_agent_icons
 
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
+    detect.cache_clear()
+    first = detect(frame)
+    assert (detect.hits, detect.misses) == (0, 1)
 
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
-    ret = hud_detection.detect_round_state(frame)
-    assert ret == hud_detection.RoundState.PRE_ROUND
+    # same pixels, different buffer -> cache hit
+    assert detect(frame.copy()) == first
+    assert (detect.hits, detect.misses) == (1, 1)
 
+    # callers get their own copy, mutating it leaves the cache intact
+    first[0].clear()
+    assert detect(frame)[0]
+
+    # pixels inside the ROI changed -> detection re-runs
+    x1, y1, _, _ = hud_detection.ROI_AGENT_ICONS
+    frame[y1, x1] = 255 - frame[y1, x1]
+    _ = detect(frame)
+    assert detect.misses == 2
 
-@pytest.mark.skip
-def test_detect_round_state_post_round_loss() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("post_round_loss.png")
 
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
+@pytest.mark.unit
+# test the death banner change gate
+def test_regions_differ(mid_round_bgr: MatLike, kill_feed_bgr: MatLike) -> None:
+    roi = hud_detection.ROI_DEATH_BANNER
+    mid_round = hud_detection.crop_roi(frame=mid_round_bgr, roi=roi)
+    death = hud_detection.crop_roi(frame=kill_feed_bgr, roi=roi)
+
+    assert hud_detection.regions_differ(prev_region=mid_round, region=death)
+    assert not hud_detection.regions_differ(prev_region=death, region=death.copy())
+    # a resized region (resolution change) always counts as changed
+    assert hud_detection.regions_differ(prev_region=death[:, :-1], region=death)
+
+
+@pytest.mark.unit
+# test the fused icon matcher scores like cv2.matchTemplate
+def test_best_matches_equals_match_template(mid_round_bgr: MatLike) -> None:
+    frame = mid_round_bgr
+
+    # first team 1 slot
+    roi = cv2.cvtColor(src=frame[30:80, 435:500], code=cv2.COLOR_BGR2GRAY)
+    bank = hud_detection._TEMPLATES[False]
+    agent, score = hud_detection._best_matches([roi], bank)[0]
+
+    # same template, matched one at a time by OpenCV
+    index = bank.names.index(agent)
+    template = bank.weighted[index].reshape(bank.shape).astype(np.uint8)
+    mask = bank.mask[index].reshape(bank.shape).astype(np.uint8)
+    result = cv2.matchTemplate(
+        image=roi,
+        templ=template,
+        method=cv2.TM_CCORR_NORMED,
+        mask=mask,
+    )
+
+    assert agent == "Clove"
+    assert score == pytest.approx(float(result.max()), abs=1e-4)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("scenario", ["mid_round.png", "kill_feed_death.png"])
+# test every alive slot's best agent clearly beats the runner-up
+def test_agent_match_margin(
+    load_scenario: Callable[[str], MatLike], scenario: str
+) -> None:
+    frame = load_scenario(scenario)
+    x1 = hud_detection.ROI_AGENT_ICONS[0]
+    strip = cv2.cvtColor(
+        src=hud_detection.crop_roi(frame=frame, roi=hud_detection.ROI_AGENT_ICONS),
+        code=cv2.COLOR_BGR2GRAY,
+    )
+
+    # same slots as detect_agent_icons, team 1 left to right, team 2 mirrored
+    for start_x, stride_x, is_mirrored in ((435, 65, False), (1423, -65, True)):
+        slots = [
+            strip[:, x - x1 : x - x1 + 65]
+            for x in range(start_x, start_x + 5 * stride_x, stride_x)
+        ]
+        alive = [
+            slot
+            for slot in slots
+            if float(cv2.meanStdDev(slot)[1][0, 0]) ** 2
+            >= hud_detection.VARIANCE_THRESHOLD
+        ]
+        scores = hud_detection._match_scores(
+            rois=alive, bank=hud_detection._TEMPLATES[is_mirrored]
         )
 
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
-    ret = hud_detection.detect_round_state(frame)
-    assert ret == hud_detection.RoundState.POST_ROUND
+        runner_up, best = np.sort(scores, axis=1)[:, -2:].T
+        assert (best >= hud_detection.MATCH_THRESHOLD).all()
+        assert (best - runner_up).min() >= 0.03
 
 
-@pytest.mark.skip
-def test_detect_round_state_post_round_won() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("post_round_win.png")
+@pytest.mark.unit
+# test the prebuilt template arrays are in sync with the agent icons
+def test_template_arrays_match_icons() -> None:
+    for is_mirrored in (False, True):
+        paths = sorted(
+            (
+                path
+                for path in files(icons).iterdir()
+                if path.name.endswith(".webp")
+                and path.name.startswith("Mirrored_") == is_mirrored
+            ),
+            key=lambda path: path.name,
+        )
+        names = [hud_detection._agent_name(path.name) for path in paths]
 
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
+        prebuilt = hud_detection._load_template_arrays(
+            is_mirrored=is_mirrored, expected_names=names
         )
+        decoded_names, decoded = hud_detection._decode_templates(paths=paths)
 
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
+        assert prebuilt is not None, "re-run src/utility/clean_agents_and_flip.py"
+        assert decoded_names == names
+        np.testing.assert_array_equal(prebuilt, decoded)
+
+
+@pytest.mark.skip
+def test_detect_round_state_buy_phase(load_scenario: Callable[[str], MatLike]) -> None:
+    frame = load_scenario("pre_round_buy_phase.png")
     ret = hud_detection.detect_round_state(frame)
-    assert ret == hud_detection.RoundState.POST_ROUND
+    assert ret == hud_detection.RoundState.PRE_ROUND
 
 
 @pytest.mark.skip
-def test_detect_round_state_post_round_ace() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("post_round_ace_won.png")
+def test_detect_round_state_post_round_loss(
+    load_scenario: Callable[[str], MatLike],
+) -> None:
+    frame = load_scenario("post_round_loss.png")
+    ret = hud_detection.detect_round_state(frame)
+    assert ret == hud_detection.RoundState.POST_ROUND
 
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
 
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
+@pytest.mark.skip
+def test_detect_round_state_post_round_won(
+    load_scenario: Callable[[str], MatLike],
+) -> None:
+    frame = load_scenario("post_round_win.png")
     ret = hud_detection.detect_round_state(frame)
     assert ret == hud_detection.RoundState.POST_ROUND
 
 
 @pytest.mark.skip
-def test_detect_round_state_mid_round() -> None:
-    # load test image from assets folder
-    test_img = files(game_scenarios).joinpath("mid_round.png")
+def test_detect_round_state_post_round_ace(
+    load_scenario: Callable[[str], MatLike],
+) -> None:
+    frame = load_scenario("post_round_ace_won.png")
+    ret = hud_detection.detect_round_state(frame)
+    assert ret == hud_detection.RoundState.POST_ROUND
 
-    with test_img.open("rb") as img_file:
-        frame = cv2.imdecode(
-            np.frombuffer(img_file.read(), np.uint8), cv2.IMREAD_UNCHANGED
-        )
 
-    if frame.shape[2] == 4:
-        frame = cv2.cvtColor(src=frame, code=cv2.COLOR_BGRA2BGR)
+@pytest.mark.skip
+def test_detect_round_state_mid_round(mid_round_bgr: MatLike) -> None:
+    frame = mid_round_bgr
     ret = hud_detection.detect_round_state(frame)
     assert ret == hud_detection.RoundState.MID_ROUND
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional
+import functools
+from typing import Optional, Self
 from unittest import mock
 
 import numpy as np
@@ -7,15 +8,41 @@ from numpy.typing import NDArray
 
 from src.capture import screen_capture
 
+# (width, height) of the monitors the capture tests run against
+RESOLUTIONS = [(640, 480), (1920, 1080), (3840, 2160)]
+
+# MSS monitor list shared by every mocked MSS instance, tests must not mutate it
+_MONITORS = [
+    None,  # index 0 is not used
+    {"left": 0, "top": 0, "width": 1920, "height": 1080},  # primary monitor at index 1
+]
+
+
+@functools.cache
+def _zero_raw(size: int) -> memoryview:
+    # zero BGRA bytes shared by every read-only MockScreenshot of this size,
+    # allocated on first use and never written to
+    return memoryview(bytes(size))
+
 
 class MockScreenshot:
     """Mock MSS screenshot object that behaves like the real one."""
 
-    def __init__(self, width: int = 1920, height: int = 1080) -> None:
+    def __init__(
+        self, width: int = 1920, height: int = 1080, writable: bool = False
+    ) -> None:
         self.width: int = width
         self.height: int = height
+        size = height * width * 4
+        # Raw BGRA bytes, like the bytearray MSS exposes as `raw`. Read-only
+        # screenshots alias the shared zero buffer instead of allocating their own
+        self.raw: bytearray | memoryview = (
+            bytearray(size) if writable else _zero_raw(size)
+        )
         # Create BGRA fake data that np.array() can convert
-        self._data: NDArray[np.uint8] = np.zeros((height, width, 4), dtype=np.uint8)
+        self._data: NDArray[np.uint8] = np.frombuffer(self.raw, dtype=np.uint8).reshape(
+            height, width, 4
+        )
 
     def __array__(
         self, dtype: Optional[type] = None, copy: Optional[bool] = None
@@ -41,7 +68,11 @@ def mock_mss_context():
     Yields:
         tuple: (mock_mss, mock_instance) for use in tests.
     """
-    with mock.patch("mss.mss") as mock_mss:
+    with (
+        mock.patch("mss.mss") as mock_mss,
+        # fresh capturer so no MSS handle is cached across tests
+        mock.patch.object(screen_capture, "_CAPTURER", screen_capture.ScreenCapturer()),
+    ):
         # create a mock instance of the mss.mss() object
         mock_instance = mock.Mock()
         mock_mss.return_value = mock_instance
@@ -51,87 +82,228 @@ def mock_mss_context():
         mock_instance.__exit__ = mock.Mock(return_value=None)
 
         # Mock the 'monitors' attribute as a list (MSS uses list-like access)
-        mock_instance.monitors = [
-            None,  # index 0 is not used
-            {
-                "left": 0,
-                "top": 0,
-                "width": 1920,
-                "height": 1080,
-            },  # primary monitor at index 1
-        ]
+        mock_instance.monitors = _MONITORS
 
         yield mock_mss, mock_instance
 
 
+class StubMSS:
+    """Plain stand-in for an mss.mss() instance, cheaper than a recording Mock."""
+
+    monitors = _MONITORS
+
+    def __init__(self, screenshot: MockScreenshot) -> None:
+        self.screenshot = screenshot
+        self.grabs = 0
+        self.closed = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def grab(self, monitor: dict[str, int]) -> MockScreenshot:
+        self.grabs += 1
+        return self.screenshot
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def stub_mss(
+    monkeypatch: pytest.MonkeyPatch, mock_screenshot: MockScreenshot
+) -> list[StubMSS]:
+    """Pytest fixture that replaces mss.mss() with StubMSS instances.
+
+    Returns:
+        list[StubMSS]: Every MSS handle opened during the test, in order.
+    """
+    opened: list[StubMSS] = []
+
+    def open_stub() -> StubMSS:
+        opened.append(StubMSS(screenshot=mock_screenshot))
+        return opened[-1]
+
+    monkeypatch.setattr(screen_capture.mss, "mss", open_stub)
+    # fresh capturer so no MSS handle is cached across tests
+    monkeypatch.setattr(screen_capture, "_CAPTURER", screen_capture.ScreenCapturer())
+    return opened
+
+
+@pytest.fixture
+def mock_cv2():
+    """Pytest fixture that patches the OpenCV window calls, so no window opens.
+
+    cv2.waitKey() returns '~', the exit key of show_screen_capture().
+
+    Yields:
+        tuple: (mock_imshow, mock_waitkey, mock_destroy_all) for use in tests.
+    """
+    with (
+        mock.patch("cv2.imshow") as mock_imshow,
+        mock.patch("cv2.waitKey") as mock_waitkey,
+        mock.patch("cv2.destroyWindow"),
+        mock.patch("cv2.destroyAllWindows") as mock_destroy,
+    ):
+        # mock the behaviour of the cv2.waitKey() to simulate pressing '~' to exit the loop
+        mock_waitkey.return_value = ord("~")
+        yield mock_imshow, mock_waitkey, mock_destroy
+
+
 @pytest.mark.unit
+@pytest.mark.parametrize(("width", "height"), RESOLUTIONS)
 def test_capture_screen(
-    mock_mss_context: tuple[mock.Mock, mock.Mock], mock_screenshot: MockScreenshot
+    mock_mss_context: tuple[mock.Mock, mock.Mock], width: int, height: int
 ) -> None:
     mock_mss, mock_instance = mock_mss_context
-    mock_instance.grab.return_value = mock_screenshot
+    mock_instance.grab.return_value = MockScreenshot(width, height)
 
     # call the capture_screen function
     result: NDArray[np.uint8] = screen_capture.capture_screen()
 
     # ensure conversion to np.array in openCV BGR format (3 channels)
     assert isinstance(result, np.ndarray)
-    assert result.shape == (1080, 1920, 3)
+    assert result.shape == (height, width, 3)
+
+    # alpha is sliced away, no BGRA -> BGR conversion copy
+    assert result.base is not None
+    assert not result.flags["C_CONTIGUOUS"]
 
     #  ensure that the grab was called once
     mock_instance.grab.assert_called_once()
     mock_mss.assert_called_once()
 
-    # Assert that __enter__ and __exit__ were called
-    mock_instance.__enter__.assert_called_once()
-    mock_instance.__exit__.assert_called_once()
+    # the MSS handle stays open for the next capture
+    mock_instance.close.assert_not_called()
 
 
 @pytest.mark.unit
-def test_show_screen_capture(mock_screenshot: MockScreenshot) -> None:
-    # mock the necessary parts to test show_screen_capture without opening windows
-    with (
-        mock.patch("mss.mss") as mock_mss,
-        mock.patch("cv2.imshow") as mock_imshow,
-        mock.patch("cv2.waitKey") as mock_waitkey,
-        mock.patch("cv2.destroyAllWindows") as mock_destroy,
-    ):
-        # create a mock instance of the mss.mss() object
-        mock_instance = mock.Mock()
-        mock_mss.return_value = mock_instance
+# test the frame is a view over the MSS pixels, never a copy
+def test_capture_screen_zero_copy(
+    mock_mss_context: tuple[mock.Mock, mock.Mock],
+) -> None:
+    _, mock_instance = mock_mss_context
+    # own pixels, this test writes to them
+    mock_screenshot = MockScreenshot(1920, 1080, writable=True)
+    mock_instance.grab.return_value = mock_screenshot
 
-        # mock the context manager methods for the mss instance
-        mock_instance.__enter__ = mock.Mock(return_value=mock_instance)
-        mock_instance.__exit__ = mock.Mock(return_value=None)
+    result = screen_capture.capture_screen()
 
-        # Mock the 'monitors' attribute as a list (MSS uses list-like access)
-        mock_instance.monitors: List[Optional[Dict[str, int]]] = [
-            None,  # index 0 is not used
-            {
-                "left": 0,
-                "top": 0,
-                "width": 1920,
-                "height": 1080,
-            },  # primary monitor at index 1
-        ]
-
-        mock_instance.grab.return_value = mock_screenshot
+    assert np.shares_memory(result, mock_screenshot._data)
+
+    # writes to the grabbed buffer show through the returned frame
+    mock_screenshot._data[0, 0] = (1, 2, 3, 255)
+    assert tuple(result[0, 0]) == (1, 2, 3)
+
+
+@pytest.mark.unit
+# test grab_into converts into the caller's buffer instead of allocating
+def test_grab_into_reuses_buffer(stub_mss: list[StubMSS]) -> None:
+    capturer = screen_capture.ScreenCapturer()
+    first = capturer.grab_into()
+    second = capturer.grab_into(dst=first)
+
+    assert second is first
+    assert second.shape == (1080, 1920, 3)
+    assert second.flags["C_CONTIGUOUS"]
 
-        # mock the behaviour of the cv2.waitKey() to simulate pressing '~' to exit the loop
-        mock_waitkey.return_value = ord("~")
 
-        # call the show_screen_capture function
-        screen_capture.show_screen_capture()
+@pytest.mark.unit
+# test the grayscale capture converts straight from BGRA
+def test_capture_screen_gray(mock_mss_context: tuple[mock.Mock, mock.Mock]) -> None:
+    _, mock_instance = mock_mss_context
+    mock_screenshot = MockScreenshot(1920, 1080, writable=True)
+    mock_screenshot._data[0, 0] = (255, 255, 255, 255)
+    mock_instance.grab.return_value = mock_screenshot
 
-        # check that imshow was called to show frame (with keyword arguments)
-        mock_imshow.assert_called_once_with(winname="Screen Capture", mat=mock.ANY)
+    result = screen_capture.capture_screen_gray()
 
-        # check that the frame show is in the correct format (BGR)
-        frame_shown: NDArray[np.uint8] = mock_imshow.call_args.kwargs["mat"]
-        assert frame_shown.shape == (1080, 1920, 3)
+    assert result.shape == (1080, 1920)
+    assert result.dtype == np.uint8
+    assert result[0, 0] == 255
+    assert result[0, 1] == 0
 
-        # ensure that cv2.destroyAll windows was called
-        mock_destroy.assert_called_once()
 
-        # ensure loop exited
-        mock_waitkey.assert_called
+@pytest.mark.unit
+# test repeated captures reuse one MSS handle
+def test_capture_screen_reuses_mss(stub_mss: list[StubMSS]) -> None:
+    for _ in range(5):
+        _ = screen_capture.capture_screen()
+
+    assert len(stub_mss) == 1
+    assert stub_mss[0].grabs == 5
+    assert not stub_mss[0].closed
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(("width", "height"), RESOLUTIONS)
+def test_show_screen_capture(
+    mock_mss_context: tuple[mock.Mock, mock.Mock],
+    mock_cv2: tuple[mock.Mock, mock.Mock, mock.Mock],
+    width: int,
+    height: int,
+) -> None:
+    _, mock_instance = mock_mss_context
+    mock_imshow, mock_waitkey, mock_destroy = mock_cv2
+    mock_instance.grab.return_value = MockScreenshot(width, height)
+
+    # call the show_screen_capture function
+    screen_capture.show_screen_capture()
+
+    # check that imshow was called to show frame (with keyword arguments)
+    mock_imshow.assert_called_once_with(winname="Screen Capture", mat=mock.ANY)
+
+    # check that the frame show is in the correct format (BGR)
+    frame_shown: NDArray[np.uint8] = mock_imshow.call_args.kwargs["mat"]
+    assert frame_shown.shape == (height, width, 3)
+
+    # ensure that cv2.destroyAll windows was called
+    mock_destroy.assert_called_once()
+
+    # ensure loop exited on the first key poll (the cleanup polls 4 more times)
+    assert mock_waitkey.call_count == 5
+
+
+@pytest.mark.unit
+def test_capture_thread(stub_mss: list[StubMSS]) -> None:
+    capture = screen_capture.CaptureThread(held_frames=2)
+    capture.start()
+    try:
+        prev_frame = capture.read(timeout=5)
+        cur_frame = capture.read(timeout=5)
+    finally:
+        capture.stop()
+
+    # frames are contiguous BGR buffers
+    assert prev_frame.shape == (1080, 1920, 3)
+    assert cur_frame.shape == (1080, 1920, 3)
+    assert cur_frame.flags["C_CONTIGUOUS"]
+
+    # both held frames live in distinct buffers, so neither gets overwritten
+    assert not np.shares_memory(prev_frame, cur_frame)
+    assert not capture.is_alive()
+
+    # the capture thread opened one MSS handle and released it on stop
+    assert len(stub_mss) == 1
+    assert stub_mss[0].closed
+
+
+@pytest.mark.unit
+# test a failing grab surfaces in read() instead of hanging the consumer
+def test_capture_thread_error(mock_mss_context: tuple[mock.Mock, mock.Mock]) -> None:
+    _, mock_instance = mock_mss_context
+    mock_instance.grab.side_effect = OSError("display lost")
+
+    capture = screen_capture.CaptureThread(held_frames=2)
+    capture.start()
+    try:
+        with pytest.raises(OSError, match="display lost"):
+            capture.read(timeout=5)
+    finally:
+        capture.stop()
+
+    # once stopped, later reads fail fast as well
+    with pytest.raises(OSError):
+        capture.read(timeout=5)